@@ -1,19 +1,43 @@
+import org.apache.pdfbox.pdmodel.PDDocument;
 import org.apache.pdfbox.text.PDFTextStripper;
 import org.apache.pdfbox.text.TextPosition;
 import java.util.ArrayList;
-import java.util.HashMap;
 import java.util.List;
-import java.util.Map;
 import java.io.IOException;
 
 public class GlyphExtractor extends PDFTextStripper {
-    private List<Map<String, Object>> glyphs;
-    
+    // Glyph data is kept column-wise so Python can fetch each column as one primitive array
+    private List<String> chars;
+    private List<Integer> pages;
+    private List<Float> xs;
+    private List<Float> ys;
+    private List<Float> widths;
+    private List<Float> heights;
+    private List<Float> fontSizes;
+
     public GlyphExtractor() throws IOException {
         super();
-        this.glyphs = new ArrayList<>();
+        this.chars = new ArrayList<>();
+        this.pages = new ArrayList<>();
+        this.xs = new ArrayList<>();
+        this.ys = new ArrayList<>();
+        this.widths = new ArrayList<>();
+        this.heights = new ArrayList<>();
+        this.fontSizes = new ArrayList<>();
+    }
+
+    @Override
+    protected void startDocument(PDDocument document) throws IOException {
+        // Extractor instances are reused across documents, so start each one with empty columns
+        chars.clear();
+        pages.clear();
+        xs.clear();
+        ys.clear();
+        widths.clear();
+        heights.clear();
+        fontSizes.clear();
     }
-    
+
     @Override
     protected void processTextPosition(TextPosition text) {
         try {
@@ -26,23 +50,56 @@ public class GlyphExtractor extends PDFTextStripper {
             float height = text.getHeight();
             String unicode = text.getUnicode();
             float fontSize = text.getFontSizeInPt();
-            
-            Map<String, Object> glyphData = new HashMap<>();
-            glyphData.put("char", unicode);
-            glyphData.put("page", getCurrentPageNo());
-            glyphData.put("x", (double)x);
-            glyphData.put("y", (double)y);
-            glyphData.put("width", (double)width);
-            glyphData.put("height", (double)height);
-            glyphData.put("fontSize", (double)fontSize);
-            
-            glyphs.add(glyphData);
+
+            chars.add(unicode);
+            pages.add(getCurrentPageNo());
+            xs.add(x);
+            ys.add(y);
+            widths.add(width);
+            heights.add(height);
+            fontSizes.add(fontSize);
         } catch (Exception e) {
             System.err.println("Error processing text position: " + e.getMessage());
         }
     }
-    
-    public List<Map<String, Object>> getGlyphs() {
-        return glyphs;
+
+    private static float[] toFloatArray(List<Float> values) {
+        float[] out = new float[values.size()];
+        for (int i = 0; i < out.length; i++) {
+            out[i] = values.get(i);
+        }
+        return out;
+    }
+
+    public String[] getChars() {
+        return chars.toArray(new String[0]);
+    }
+
+    public int[] getPages() {
+        int[] out = new int[pages.size()];
+        for (int i = 0; i < out.length; i++) {
+            out[i] = pages.get(i);
+        }
+        return out;
+    }
+
+    public float[] getXs() {
+        return toFloatArray(xs);
+    }
+
+    public float[] getYs() {
+        return toFloatArray(ys);
+    }
+
+    public float[] getWidths() {
+        return toFloatArray(widths);
+    }
+
+    public float[] getHeights() {
+        return toFloatArray(heights);
+    }
+
+    public float[] getFontSizes() {
+        return toFloatArray(fontSizes);
     }
 }
@@ -1,6 +1,29 @@
+from dataclasses import dataclass, fields
+
 import jpype
 import jpype.imports
 from jpype.types import *
+import numpy as np
+
+
+@dataclass
+class Glyphs:
+    """Glyph records stored column-wise, one array entry per glyph."""
+    chars: np.ndarray       # str
+    pages: np.ndarray       # int32, 1-based page numbers
+    xs: np.ndarray          # float64, bottom-left origin
+    ys: np.ndarray          # float64
+    widths: np.ndarray      # float64
+    heights: np.ndarray     # float64
+    font_sizes: np.ndarray  # float32
+
+    def __len__(self):
+        return len(self.pages)
+
+    def select(self, index):
+        """Return the subset of glyphs picked by a boolean mask or index array."""
+        return Glyphs(*(getattr(self, f.name)[index] for f in fields(self)))
+
 
 def start_pdfbox():
     if jpype.isJVMStarted():
@@ -16,46 +39,52 @@ def start_pdfbox():
     jpype.startJVM(classpath=cp)
 
 
+# Java handles are looked up once per process, after the JVM has started
+_FILE_CLASS = None
+_PDDOCUMENT_CLASS = None
+_GLYPH_EXTRACTOR_CLASS = None
+_extractor = None
+
+
+def _get_extractor():
+    """Start the JVM if needed and return this process's reusable GlyphExtractor."""
+    global _FILE_CLASS, _PDDOCUMENT_CLASS, _GLYPH_EXTRACTOR_CLASS, _extractor
+    if _extractor is None:
+        start_pdfbox()
+
+        # Import Java classes after JVM is started
+        import java.io
+        import org.apache.pdfbox.pdmodel
+
+        _FILE_CLASS = java.io.File
+        _PDDOCUMENT_CLASS = org.apache.pdfbox.pdmodel.PDDocument
+        _GLYPH_EXTRACTOR_CLASS = jpype.JClass("GlyphExtractor")
+
+        _extractor = _GLYPH_EXTRACTOR_CLASS()
+        _extractor.setSortByPosition(True)
+    return _extractor
+
+
 def extract_glyph_bboxes(pdf_path):
-    start_pdfbox()
-    
-    # Import Java classes after JVM is started
-    import java.io
-    import org.apache.pdfbox.pdmodel
-    import org.apache.pdfbox.text
-    
-    File = java.io.File
-    PDDocument = org.apache.pdfbox.pdmodel.PDDocument
-    PDFTextStripper = org.apache.pdfbox.text.PDFTextStripper
-    
-    # Compile and load custom Java class
-    GlyphExtractor = jpype.JClass("GlyphExtractor")
-    
+    extractor = _get_extractor()
+
     # load PDF
-    doc = PDDocument.load(File(pdf_path))
-    extractor = GlyphExtractor()
-    extractor.setSortByPosition(True)
-    extractor.setStartPage(1)
-    extractor.setEndPage(doc.getNumberOfPages())
-
-    extractor.getText(doc)
-    doc.close()
-
-    # Extract glyphs from Java object
-    glyphs = []
-    java_list = extractor.getGlyphs()
-    for i in range(java_list.size()):
-        glyph_map = java_list.get(i)
-        glyphs.append({
-            "char": str(glyph_map.get("char")),
-            "page": int(glyph_map.get("page")),
-            "bbox": (
-                float(glyph_map.get("x")),
-                float(glyph_map.get("y")),
-                float(glyph_map.get("width")),
-                float(glyph_map.get("height"))
-            ),
-            "fontSize": float(glyph_map.get("fontSize"))
-        })
-    
-    return glyphs
+    doc = _PDDOCUMENT_CLASS.load(_FILE_CLASS(pdf_path))
+    try:
+        extractor.setStartPage(1)
+        extractor.setEndPage(doc.getNumberOfPages())
+        extractor.getText(doc)
+    finally:
+        doc.close()
+
+    # Numeric columns come back as Java primitive arrays and convert in one JNI crossing
+    # each; chars is a String[], so every element is still converted individually
+    return Glyphs(
+        chars=np.array([str(ch) for ch in extractor.getChars()], dtype=str),
+        pages=np.asarray(extractor.getPages(), dtype=np.int32),
+        xs=np.asarray(extractor.getXs(), dtype=np.float64),
+        ys=np.asarray(extractor.getYs(), dtype=np.float64),
+        widths=np.asarray(extractor.getWidths(), dtype=np.float64),
+        heights=np.asarray(extractor.getHeights(), dtype=np.float64),
+        font_sizes=np.asarray(extractor.getFontSizes(), dtype=np.float32),
+    )
@@ -2,147 +2,117 @@ import os
 import glob
 import io
 import argparse
+import contextlib
 import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import replace
 from typing import Dict, List, Tuple
 
-from PyPDF2 import PdfReader, PdfWriter
+import numpy as np
+from pypdf import PdfReader, PdfWriter
 from reportlab.pdfgen import canvas
 from reportlab.lib.colors import Color
+from reportlab.lib.rl_accel import fp_str
 
-from finder import extract_glyph_bboxes
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy kernel is used instead
+    njit = None
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard json module is used instead
+    orjson = None
 
-def intersects(a, b):
-    """Check if two bounding boxes intersect."""
-    ax, ay, aw, ah = a
-    bx, by, bw, bh = b
-    return not (ax+aw <= bx or bx+bw <= ax or ay+ah <= by or by+bh <= ay)
+from finder import Glyphs, extract_glyph_bboxes
 
 
-def calculate_overlap_percentage(a, b):
-    """Calculate the percentage of overlap between two bounding boxes.
-    
-    Returns:
-        dict with:
-        - overlap_area: intersection area
-        - percentage_of_a: what % of box A is overlapped
-        - percentage_of_b: what % of box B is overlapped
-        - percentage_of_total: overlap as % of combined area
-    """
-    ax, ay, aw, ah = a
-    bx, by, bw, bh = b
-    
-    # Calculate intersection rectangle
-    x_left = max(ax, bx)
-    y_bottom = max(ay, by)
-    x_right = min(ax + aw, bx + bw)
-    y_top = min(ay + ah, by + bh)
-    
-    if x_right < x_left or y_top < y_bottom:
-        # No intersection
-        return {
-            "overlap_area": 0.0,
-            "percentage_of_a": 0.0,
-            "percentage_of_b": 0.0,
-            "percentage_of_total": 0.0
-        }
-    
-    # Calculate areas
-    overlap_area = (x_right - x_left) * (y_top - y_bottom)
-    area_a = aw * ah
-    area_b = bw * bh
-    total_area = area_a + area_b - overlap_area  # Union area
-    
-    return {
-        "overlap_area": round(overlap_area, 2),
-        "percentage_of_a": round((overlap_area / area_a * 100) if area_a > 0 else 0, 2),
-        "percentage_of_b": round((overlap_area / area_b * 100) if area_b > 0 else 0, 2),
-        "percentage_of_total": round((overlap_area / total_area * 100) if total_area > 0 else 0, 2)
-    }
+# Letters that appear individually in diagonal watermark text (UNCORRECTED PROOF, DRAFT, ...)
+_WATERMARK_CHARS = frozenset('UNCORRECTEDPROFDTALIMWY')
 
+# Glyphs at or above this size are always watermarks; single watermark letters
+# are filtered above the letter threshold
+_WATERMARK_FONT_SIZE = 40
+_WATERMARK_LETTER_FONT_SIZE = 20
 
-def is_watermark(glyph, watermark_font_size=40, watermark_patterns=None):
+
+def watermark_mask(chars: np.ndarray, font_sizes: np.ndarray, watermark_font_size=_WATERMARK_FONT_SIZE):
     """
-    Check if a glyph is likely part of a watermark.
-    
+    Flag glyphs that are likely part of a watermark, over whole glyph columns.
+
     Args:
-        glyph: Glyph dict with 'char' and 'fontSize' keys
+        chars: str array of glyph characters
+        font_sizes: array of glyph font sizes
         watermark_font_size: Font size threshold for watermarks (default: 40pt)
-        watermark_patterns: List of watermark text patterns to filter (default: common watermarks)
+
+    Returns:
+        bool array, True where the glyph is likely part of a watermark
     """
-    if watermark_patterns is None:
-        watermark_patterns = [
-            'UNCORRECTED', 'CORRECTED', 'PROOF', 'DRAFT', 
-            'CONFIDENTIAL', 'PRELIMINARY', 'WATERMARK'
-        ]
-    
+    if watermark_font_size <= _WATERMARK_LETTER_FONT_SIZE:
+        return font_sizes >= watermark_font_size
+
+    # Body text is below the letter threshold, so only the few larger glyphs are
+    # looked at further
+    mask = np.zeros(len(font_sizes), dtype=bool)
+    candidates = np.flatnonzero(font_sizes > _WATERMARK_LETTER_FONT_SIZE)
+    if len(candidates) == 0:
+        return mask
+
     # Filter by large font size
-    if glyph.get('fontSize', 0) >= watermark_font_size:
-        return True
-    
-    # Filter by watermark character patterns (single letters from diagonal text)
-    char = glyph['char']
-    if glyph.get('fontSize', 0) > 20:
-        # Common watermark letters that appear individually
-        watermark_chars = set('UNCORRECTEDPROFDTALIMWY')
-        if len(char) == 1 and char.upper() in watermark_chars:
-            return True
-    
-    return False
+    large = font_sizes[candidates] >= watermark_font_size
+    mask[candidates[large]] = True
+
+    # Single watermark letters from diagonal text in the 20pt+ range. Checked per
+    # character in Python: np.char.upper keeps the input's fixed width, which
+    # truncates multi-character uppercase forms (e.g. 'ﬁ' -> 'F').
+    mid = candidates[~large]
+    if len(mid):
+        mask[mid] = [len(c) == 1 and c.upper() in _WATERMARK_CHARS for c in chars[mid].tolist()]
+
+    return mask
+
+
+# Per-character (left/right, top/bottom) trim fractions, built once at import.
+# Categories listed first win when a character appears in several.
+_CHAR_TRIM_CATEGORIES = (
+    (",.;:`'\"", (0.25, 0.25)),  # small punctuation
+    ("il|1t", (0.12, 0.18)),  # thin stems
+    ("fj", (0.10, 0.12)),  # hooks
+    ("()[]{}", (0.08, 0.10)),  # brackets
+    ("“”‘’\"'", (0.08, 0.10)),  # quotes
+    ("+-=×÷/*\\", (0.10, 0.10)),  # math operators
+    ("˜^~ˇ˘¨˚˙˛˝", (0.20, 0.20)),  # common diacritics and tilde
+)
+_CHAR_TRIM: Dict[str, Tuple[float, float]] = {
+    ch: trim for chars, trim in reversed(_CHAR_TRIM_CATEGORIES) for ch in chars
+}
+
+_TRIM_DIGIT = (0.06, 0.08)
+_TRIM_ALPHA = (0.07, 0.10)
+_TRIM_DEFAULT = (0.05, 0.05)  # light trim
 
 
 def _get_char_trim_percents(ch: str, scale: float = 1.0):
-    """Return per-side trim percentages for a given character (0.0-1.0 per side)."""
-    # Defaults (light trim)
-    lr = 0.05 * scale
-    tb = 0.05 * scale
-
-    # Categories
-    punct_small = set(list(",.;:`'\""))
-    thin_stems = set(list("il|1t"))
-    hooks = set(list("fj"))
-    brackets = set(list("()[]{}"))
-    math_ops = set(list("+-=×÷/*\\"))
-    quotes = set(list("“”‘’\"'"))
-    diacritics = set(list("˜^~ˇ˘¨˚˙˛˝"))  # include common diacritics and tilde
-
-    if ch in punct_small:
-        lr, tb = 0.25 * scale, 0.25 * scale
-    elif ch in thin_stems:
-        lr, tb = 0.12 * scale, 0.18 * scale
-    elif ch in hooks:
-        lr, tb = 0.10 * scale, 0.12 * scale
-    elif ch in brackets or ch in quotes:
-        lr, tb = 0.08 * scale, 0.10 * scale
-    elif ch in math_ops:
-        lr, tb = 0.10 * scale, 0.10 * scale
-    elif ch in diacritics:
-        lr, tb = 0.20 * scale, 0.20 * scale
-    else:
-        # Letters/digits default
-        if ch.isdigit():
-            lr, tb = 0.06 * scale, 0.08 * scale
-        elif ch.isalpha():
-            lr, tb = 0.07 * scale, 0.10 * scale
-
-    # Per-side (left,right,top,bottom) all same for now; could specialize later
-    return {
-        'left': lr,
-        'right': lr,
-        'top': tb,
-        'bottom': tb,
-    }
+    """Return per-side (left, right, top, bottom) trim percentages for a character (0.0-1.0 per side)."""
+    lr, tb = _CHAR_TRIM.get(ch) or (
+        _TRIM_DIGIT if ch.isdigit() else _TRIM_ALPHA if ch.isalpha() else _TRIM_DEFAULT
+    )
+    lr *= scale
+    tb *= scale
+    # Per-side all same for now; could specialize later
+    return lr, lr, tb, tb
 
 
 def _apply_trim(bbox, percents):
-    """Apply per-side percentage trim to bbox (x,y,w,h) with safety checks."""
-    x, y, w, h = map(float, bbox)
-    if w <= 0 or h <= 0:
-        return x, y, w, h
-    lt = percents.get('left', 0.0)
-    rt = percents.get('right', 0.0)
-    tp = percents.get('top', 0.0)
-    bt = percents.get('bottom', 0.0)
+    """
+    Apply per-side (left, right, top, bottom) percentage trim to bbox columns (x, y, w, h).
+
+    Works element-wise on arrays; boxes with w <= 0 or h <= 0 are left untouched.
+    """
+    x, y, w, h = (np.asarray(v, dtype=np.float64) for v in bbox)
+    lt, rt, tp, bt = percents
+    valid = (w > 0) & (h > 0)
 
     # Compute absolute trims
     dx_left = w * lt
@@ -151,66 +121,376 @@ def _apply_trim(bbox, percents):
     dy_bottom = h * bt
 
     # Apply trims (y is bottom-left origin internally)
-    new_x = x + dx_left
-    new_y = y + dy_bottom
-    new_w = max(0.1, w - dx_left - dx_right)
-    new_h = max(0.1, h - dy_top - dy_bottom)
+    new_x = np.where(valid, x + dx_left, x)
+    new_y = np.where(valid, y + dy_bottom, y)
+    new_w = np.where(valid, np.maximum(0.1, w - dx_left - dx_right), w)
+    new_h = np.where(valid, np.maximum(0.1, h - dy_top - dy_bottom), h)
     return new_x, new_y, new_w, new_h
 
 
-def group_glyphs_by_page(glyphs_list, filter_watermarks=True, enable_char_trim=False, trim_scale=1.0):
+def group_glyphs_by_page(glyphs: Glyphs, filter_watermarks=True, enable_char_trim=False, trim_scale=1.0) -> Dict[int, Tuple[np.ndarray, np.ndarray]]:
     """
     Group glyphs by page number and optionally filter watermarks.
     Optionally apply character-specific whitespace trimming to glyph bboxes.
-    Input: flat list of glyph dicts with 'page', 'bbox', 'char', and 'fontSize' keys
-    Returns: dict[page_number(int starting at 1)] -> list of glyph dicts.
+    Input: Glyphs columns for the whole document
+    Returns: dict[page_number(int starting at 1)] -> (boxes, chars) for that page, in extraction order,
+    where boxes is a contiguous float64 (N, 4) array of (x, y, w, h) and chars the matching str array.
     """
-    by_page = {}
     filtered_count = 0
     trimmed_count = 0
-    
-    for g in glyphs_list:
-        page = g.get('page')
-        if page is None:
-            raise ValueError("Glyph record missing page number")
-        page = int(page)
-        
-        # Skip watermarks if filtering enabled
-        if filter_watermarks and is_watermark(g):
-            filtered_count += 1
-            continue
-        
-        # Trim bbox if enabled
-        bbox = g['bbox']
-        if enable_char_trim:
-            perc = _get_char_trim_percents(g['char'], scale=trim_scale)
-            bbox = _apply_trim(bbox, perc)
-            trimmed_count += 1
-        
-        glyph_dict = {
-            'char': g['char'],
-            'x': bbox[0],
-            'y': bbox[1],
-            'width': bbox[2],
-            'height': bbox[3]
-        }
-        by_page.setdefault(page, []).append(glyph_dict)
-    
+
+    # Skip watermarks if filtering enabled
+    if filter_watermarks:
+        mask = watermark_mask(glyphs.chars, glyphs.font_sizes)
+        filtered_count = int(np.count_nonzero(mask))
+        glyphs = glyphs.select(~mask)
+
+    # Trim bbox if enabled (one trim lookup per distinct character)
+    if enable_char_trim and len(glyphs):
+        uniq_chars, inverse = np.unique(glyphs.chars, return_inverse=True)
+        percents = np.array([_get_char_trim_percents(ch, scale=trim_scale) for ch in uniq_chars.tolist()])
+        xs, ys, widths, heights = _apply_trim(
+            (glyphs.xs, glyphs.ys, glyphs.widths, glyphs.heights), percents[inverse.ravel()].T
+        )
+        glyphs = replace(glyphs, xs=xs, ys=ys, widths=widths, heights=heights)
+        trimmed_count = len(glyphs)
+
+    # Split into per-page box arrays, keeping extraction order within each page
+    boxes = np.column_stack((glyphs.xs, glyphs.ys, glyphs.widths, glyphs.heights)).astype(np.float64, copy=False)
+    order = np.argsort(glyphs.pages, kind='stable')
+    page_nums, starts = np.unique(glyphs.pages[order], return_index=True)
+    bounds = np.append(starts, len(order))
+    by_page = {}
+    for k, page in enumerate(page_nums):
+        page_order = order[bounds[k]:bounds[k + 1]]
+        by_page[int(page)] = (boxes[page_order], glyphs.chars[page_order])
+
     if filter_watermarks and filtered_count > 0:
         print(f"  (Filtered {filtered_count} watermark glyphs)", end=" ")
     if enable_char_trim and trimmed_count > 0:
         print(f"  (Trimmed {trimmed_count} glyph boxes)", end=" ")
-    
+
     return by_page
 
 
-def find_overlaps_by_page(glyphs_by_page: Dict[int, List[dict]], overlap_percentage_threshold: float = 0.0):
+# Boxes spanning more grid cells than this (e.g. a rule or frame drawn as one glyph)
+# are kept out of the grid and tested directly against every box on the page
+_GRID_MAX_SPAN_CELLS = 64
+
+
+def _grid_buckets(boxes: np.ndarray):
+    """
+    Bin glyph boxes into a uniform grid sized to the median glyph extent.
+
+    Each box is inserted into every cell it spans (typically 1-2 per axis).
+    Degenerate boxes (w <= 0 or h <= 0) can never overlap and are left out.
+    Boxes spanning more than _GRID_MAX_SPAN_CELLS cells are returned separately
+    instead of being inserted, so one huge box cannot blow up the bucket arrays.
+
+    Returns:
+        (members, bounds, cell_x, cell_y, cell, large) where members[bounds[k]:bounds[k+1]]
+        are the glyph indices (ascending) in bucket k located at grid cell
+        (cell_x[k], cell_y[k]), cell is the grid cell size and large holds the
+        indices of the boxes left out for spanning too many cells.
+    """
+    x1 = boxes[:, 0]
+    y1 = boxes[:, 1]
+    w = boxes[:, 2]
+    h = boxes[:, 3]
+
+    idx = np.flatnonzero((w > 0) & (h > 0))
+    if len(idx) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, np.zeros(1, dtype=np.int64), empty, empty, 1.0, empty
+
+    cell = float(max(np.median(h[idx]), np.median(w[idx])))
+    if not cell > 0:
+        cell = 1.0
+
+    cx0 = np.floor(x1[idx] / cell).astype(np.int64)
+    cy0 = np.floor(y1[idx] / cell).astype(np.int64)
+    span_x = np.floor((x1[idx] + w[idx]) / cell).astype(np.int64) - cx0 + 1
+    span_y = np.floor((y1[idx] + h[idx]) / cell).astype(np.int64) - cy0 + 1
+    counts = span_x * span_y
+
+    small = counts <= _GRID_MAX_SPAN_CELLS
+    large = idx[~small].astype(np.int64)
+    if len(large):
+        idx, cx0, cy0, span_x, counts = idx[small], cx0[small], cy0[small], span_x[small], counts[small]
+
+    # One (cell, glyph) entry per spanned cell
+    owner = np.repeat(idx.astype(np.int64), counts)
+    offset = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+    sx = np.repeat(span_x, counts)
+    gx = np.repeat(cx0, counts) + offset % sx
+    gy = np.repeat(cy0, counts) + offset // sx
+
+    order = np.lexsort((owner, gy, gx))
+    owner, gx, gy = owner[order], gx[order], gy[order]
+
+    new_bucket = np.ones(len(owner), dtype=bool)
+    new_bucket[1:] = (gx[1:] != gx[:-1]) | (gy[1:] != gy[:-1])
+    starts = np.flatnonzero(new_bucket)
+    bounds = np.append(starts, len(owner))
+
+    return owner, bounds, gx[starts], gy[starts], cell, large
+
+
+def _grid_candidate_pairs(boxes: np.ndarray, members, bounds, cell_x, cell_y, cell):
+    """
+    Enumerate candidate glyph pairs (i < j) that share a grid cell.
+
+    A pair sharing several cells is only reported from the cell holding the
+    lower-left corner of its intersection, so every intersecting pair appears
+    exactly once. That corner is returned alongside the pair so the overlap
+    evaluation does not have to recompute it.
+
+    Returns:
+        (ci, cj, x_left, y_bottom) arrays, one entry per candidate pair
+    """
+    sizes = np.diff(bounds)
+
+    # Pair every bucket entry with the entries after it in the same bucket
+    pos = np.arange(len(members))
+    partners = np.repeat(bounds[1:], sizes) - pos - 1
+    left = np.repeat(pos, partners)
+    right = left + 1 + np.arange(len(left)) - np.repeat(np.cumsum(partners) - partners, partners)
+
+    ci = members[left]
+    cj = members[right]
+    bucket = np.repeat(np.arange(len(sizes)), sizes)[left]
+
+    x_left = np.maximum(boxes[ci, 0], boxes[cj, 0])
+    y_bottom = np.maximum(boxes[ci, 1], boxes[cj, 1])
+    keep = (
+        (np.floor(x_left / cell).astype(np.int64) == cell_x[bucket])
+        & (np.floor(y_bottom / cell).astype(np.int64) == cell_y[bucket])
+    )
+
+    return ci[keep], cj[keep], x_left[keep], y_bottom[keep]
+
+
+def _large_candidate_pairs(boxes: np.ndarray, large: np.ndarray):
+    """
+    Enumerate candidate pairs (i < j) between the boxes left out of the grid and
+    every other non-degenerate box on the page, each pair once.
+
+    Returns:
+        (ci, cj, x_left, y_bottom) arrays, one entry per candidate pair
+    """
+    valid = np.flatnonzero((boxes[:, 2] > 0) & (boxes[:, 3] > 0))
+    is_large = np.zeros(len(boxes), dtype=bool)
+    is_large[large] = True
+
+    ci_parts = []
+    cj_parts = []
+    for i in large.tolist():
+        # Pairs of two large boxes are taken from the lower index only
+        partners = valid[(~is_large[valid]) | (valid > i)]
+        partners = partners[partners != i]
+        ci_parts.append(np.minimum(partners, i))
+        cj_parts.append(np.maximum(partners, i))
+
+    ci = np.concatenate(ci_parts)
+    cj = np.concatenate(cj_parts)
+    x_left = np.maximum(boxes[ci, 0], boxes[cj, 0])
+    y_bottom = np.maximum(boxes[ci, 1], boxes[cj, 1])
+    return ci, cj, x_left, y_bottom
+
+
+def _overlaps_numpy(boxes: np.ndarray, ci, cj, x_left, y_bottom):
+    """NumPy overlap evaluation over candidate pairs (unordered results)."""
+    # Intersection extents reuse the corner computed for the grid dedup
+    x_right = boxes[:, 0] + boxes[:, 2]
+    y_top = boxes[:, 1] + boxes[:, 3]
+    iw = np.minimum(x_right[ci], x_right[cj]) - x_left
+    ih = np.minimum(y_top[ci], y_top[cj]) - y_bottom
+    hit = (iw > 0) & (ih > 0)
+
+    # Areas, union and percentage only for pairs that actually intersect
+    ci, cj = ci[hit], cj[hit]
+    area = boxes[:, 2] * boxes[:, 3]
+    overlap_area = iw[hit] * ih[hit]
+    union_area = area[ci] + area[cj] - overlap_area
+    pct = np.where(union_area > 0, overlap_area / union_area * 100, 0.0)
+    return ci, cj, overlap_area, pct
+
+
+def _overlaps_kernel(boxes, members, bounds, cell_x, cell_y, cell):
+    """
+    Scalar overlap scan over grid buckets, compiled with numba when available.
+
+    Walks every bucket's member pairs, computes the intersection inline and
+    appends intersecting pairs to preallocated arrays that double when full.
+    """
+    cap = 64
+    out_i = np.empty(cap, np.int64)
+    out_j = np.empty(cap, np.int64)
+    out_area = np.empty(cap, np.float64)
+    out_pct = np.empty(cap, np.float64)
+    count = 0
+
+    for k in range(len(bounds) - 1):
+        end = bounds[k + 1]
+        for p in range(bounds[k], end):
+            i = members[p]
+            ax = boxes[i, 0]
+            ay = boxes[i, 1]
+            aw = boxes[i, 2]
+            ah = boxes[i, 3]
+            for q in range(p + 1, end):
+                j = members[q]
+                bx = boxes[j, 0]
+                by = boxes[j, 1]
+                bw = boxes[j, 2]
+                bh = boxes[j, 3]
+
+                x_left = max(ax, bx)
+                y_bottom = max(ay, by)
+                # Report each pair only from the cell holding its intersection corner
+                if np.floor(x_left / cell) != cell_x[k] or np.floor(y_bottom / cell) != cell_y[k]:
+                    continue
+
+                iw = min(ax + aw, bx + bw) - x_left
+                ih = min(ay + ah, by + bh) - y_bottom
+                if iw <= 0 or ih <= 0:
+                    continue
+
+                overlap_area = iw * ih
+                union_area = aw * ah + bw * bh - overlap_area
+                pct = overlap_area / union_area * 100 if union_area > 0 else 0.0
+
+                if count == cap:
+                    cap *= 2
+                    grown_i = np.empty(cap, np.int64)
+                    grown_j = np.empty(cap, np.int64)
+                    grown_area = np.empty(cap, np.float64)
+                    grown_pct = np.empty(cap, np.float64)
+                    grown_i[:count] = out_i
+                    grown_j[:count] = out_j
+                    grown_area[:count] = out_area
+                    grown_pct[:count] = out_pct
+                    out_i, out_j, out_area, out_pct = grown_i, grown_j, grown_area, grown_pct
+
+                out_i[count] = i
+                out_j[count] = j
+                out_area[count] = overlap_area
+                out_pct[count] = pct
+                count += 1
+
+    return out_i[:count], out_j[:count], out_area[:count], out_pct[:count]
+
+
+_overlaps_numba = njit(cache=True, nogil=True)(_overlaps_kernel) if njit is not None else None
+
+
+def _page_overlap_pairs(boxes: np.ndarray, overlap_percentage_threshold: float = 0.0):
+    """
+    Overlap scan for one page over grid candidate pairs.
+
+    Uses the numba-compiled kernel when numba is installed, otherwise the
+    vectorized NumPy implementation.
+
+    Args:
+        boxes: float64 array of shape (N, 4) holding (x, y, w, h) per glyph
+        overlap_percentage_threshold: Minimum percentage_of_union (0-100) a pair must exceed
+
+    Returns:
+        (i_idx, j_idx, overlap_area, percentage_of_union, filtered_count) where
+        i_idx < j_idx index into boxes and pairs are ordered by (i, j). Areas and
+        percentages are unrounded.
+    """
+    # No-op for the contiguous float64 arrays built by group_glyphs_by_page
+    boxes = np.ascontiguousarray(boxes, dtype=np.float64)
+    members, bounds, cell_x, cell_y, cell, large = _grid_buckets(boxes)
+    if _overlaps_numba is not None:
+        ci, cj, overlap_area, pct = _overlaps_numba(boxes, members, bounds, cell_x, cell_y, cell)
+    else:
+        ci, cj, overlap_area, pct = _overlaps_numpy(
+            boxes, *_grid_candidate_pairs(boxes, members, bounds, cell_x, cell_y, cell)
+        )
+
+    # Boxes too large for the grid are checked against the whole page
+    if len(large):
+        li, lj, large_area, large_pct = _overlaps_numpy(boxes, *_large_candidate_pairs(boxes, large))
+        ci = np.concatenate((ci, li))
+        cj = np.concatenate((cj, lj))
+        overlap_area = np.concatenate((overlap_area, large_area))
+        pct = np.concatenate((pct, large_pct))
+
+    # The threshold applies to the percentage rounded to 2 decimals with Python's round().
+    # np.round can land on the other side of a .xx5 boundary, which only matters for
+    # pairs within 0.01 of the threshold, so those are re-rounded in Python.
+    rounded = np.round(pct, 2)
+    near = np.flatnonzero(np.abs(pct - overlap_percentage_threshold) <= 0.01)
+    rounded[near] = [round(p, 2) for p in pct[near].tolist()]
+    keep = rounded > overlap_percentage_threshold
+    filtered_count = len(keep) - int(np.count_nonzero(keep))
+    ci, cj, overlap_area, pct = ci[keep], cj[keep], overlap_area[keep], pct[keep]
+
+    order = np.lexsort((cj, ci))
+    return ci[order], cj[order], overlap_area[order], pct[order], filtered_count
+
+
+def _scan_page(page_num: int, boxes: np.ndarray, chars: np.ndarray, overlap_percentage_threshold: float = 0.0):
+    """
+    Find all overlapping glyphs on a single page.
+
+    Returns:
+        tuple: (page_num, page_overlaps, page_rects, filtered_count)
+    """
+    page_overlaps = []
+    if len(boxes) < 2:
+        return page_num, page_overlaps, [], 0
+
+    i_idx, j_idx, overlap_area, pct_union, filtered_count = _page_overlap_pairs(boxes, overlap_percentage_threshold)
+
+    # Remaining metrics for the survivors only; a positive intersection implies
+    # both boxes have positive area
+    pct_a = overlap_area / (boxes[i_idx, 2] * boxes[i_idx, 3]) * 100
+    pct_b = overlap_area / (boxes[j_idx, 2] * boxes[j_idx, 3]) * 100
+
+    # Only the surviving pairs are turned back into Python objects, one bulk tolist() per column.
+    # Metrics are rounded with Python's round(), which np.round does not always match on .xx5 values.
+    columns = (
+        boxes[i_idx].tolist(), boxes[j_idx].tolist(), chars[i_idx].tolist(), chars[j_idx].tolist(),
+        overlap_area.tolist(), pct_a.tolist(), pct_b.tolist(), pct_union.tolist()
+    )
+    for box_a, box_b, char_a, char_b, area, pa, pb, pct in zip(*columns):
+        pct = round(pct, 2)
+        page_overlaps.append({
+            'page': page_num,
+            'a': tuple(box_a),
+            'b': tuple(box_b),
+            'char_a': char_a,
+            'char_b': char_b,
+            'percentage_of_union': pct,
+            'metrics': {
+                'overlap_area': round(area, 2),
+                'percentage_of_a': round(pa, 2),
+                'percentage_of_b': round(pb, 2),
+                'percentage_of_total': pct
+            }
+        })
+
+    # Unique boxes involved in any overlap, deduplicated in one sort pass
+    hit = np.unique(np.concatenate((i_idx, j_idx)))
+    page_rects = [tuple(rect) for rect in np.unique(boxes[hit], axis=0).tolist()]
+
+    return page_num, page_overlaps, page_rects, filtered_count
+
+
+def find_overlaps_by_page(glyphs_by_page: Dict[int, Tuple[np.ndarray, np.ndarray]], overlap_percentage_threshold: float = 0.0, max_workers=None):
     """
     Find all overlapping glyphs on each page.
+
+    Pages are scanned concurrently on a thread pool; the NumPy and numba
+    kernels release the GIL while they run.
     
     Args:
-        glyphs_by_page: Dict of page number to list of glyph dicts
+        glyphs_by_page: Dict of page number to (boxes, chars) arrays, as built by group_glyphs_by_page
         overlap_percentage_threshold: Only include overlaps where percentage_of_union exceeds this value (0-100)
+        max_workers: Page scan threads (default: ThreadPoolExecutor's default; 1 = scan pages in the calling thread)
     
     Returns:
       - overlaps: list of overlap info dicts
@@ -223,41 +503,24 @@ def find_overlaps_by_page(glyphs_by_page: Dict[int, List[dict]], overlap_percent
     total = 0
     filtered_count = 0
 
-    for page_num, glyphs in glyphs_by_page.items():
-        n = len(glyphs)
-        page_rects = set()
+    def scan(item):
+        page_num, (boxes, chars) = item
+        return _scan_page(page_num, boxes, chars, overlap_percentage_threshold)
 
-        for i in range(n):
-            gi = glyphs[i]
-            box_i = (float(gi['x']), float(gi['y']), float(gi['width']), float(gi['height']))
-            
-            for j in range(i + 1, n):
-                gj = glyphs[j]
-                box_j = (float(gj['x']), float(gj['y']), float(gj['width']), float(gj['height']))
-
-                if intersects(box_i, box_j):
-                    # Calculate overlap percentage
-                    overlap_metrics = calculate_overlap_percentage(box_i, box_j)
-                    percentage_of_union = overlap_metrics['percentage_of_total']
-                    
-                    # Only include if exceeds threshold
-                    if percentage_of_union > overlap_percentage_threshold:
-                        total += 1
-                        overlaps.append({
-                            'page': page_num,
-                            'a': box_i,
-                            'b': box_j,
-                            'char_a': gi['char'],
-                            'char_b': gj['char'],
-                            'percentage_of_union': percentage_of_union
-                        })
-                        page_rects.add(box_i)
-                        page_rects.add(box_j)
-                    else:
-                        filtered_count += 1
+    items = list(glyphs_by_page.items())
+    if len(items) > 1 and max_workers != 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            page_results = list(executor.map(scan, items))
+    else:
+        page_results = [scan(item) for item in items]
 
+    # Merge per-page results in page order
+    for page_num, page_overlaps, page_rects, page_filtered in page_results:
+        overlaps.extend(page_overlaps)
+        total += len(page_overlaps)
+        filtered_count += page_filtered
         if page_rects:
-            highlights_by_page[page_num] = list(page_rects)
+            highlights_by_page[page_num] = page_rects
 
     return overlaps, highlights_by_page, total, filtered_count
 
@@ -299,28 +562,33 @@ def annotate_pdf(input_pdf_path: str, highlights_by_page: Dict[int, List[Tuple[f
         output_pdf_path: Path for output PDF
         add_labels: If True, add position labels like "bottom-left" near each overlap
     """
-    reader = PdfReader(open(input_pdf_path, "rb"))
+    reader = PdfReader(input_pdf_path)
     writer = PdfWriter()
 
-    num_pages = len(reader.pages)
-    for page_idx in range(num_pages):
+    # Draw the overlays into one multi-page canvas so the overlay PDF is parsed only once.
+    # Pages without highlights get no overlay page at all.
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf)
+    overlay_page_indices = []
+
+    for page_idx, page in enumerate(reader.pages):
         page_num_1_based = page_idx + 1
-        page = reader.pages[page_idx]
+        rects = highlights_by_page.get(page_num_1_based)
+        if not rects:
+            continue
+        overlay_page_indices.append(page_idx)
 
         # Get page dimensions
         page_width = float(page.mediabox.width)
         page_height = float(page.mediabox.height)
 
-        # Create overlay with red rectangles
-        buf = io.BytesIO()
-        c = canvas.Canvas(buf, pagesize=(page_width, page_height))
+        # Create overlay page with red rectangles
+        c.setPageSize((page_width, page_height))
         red = Color(1, 0, 0, alpha=0.3)  # semi-transparent red
         c.setStrokeColor(red)
         c.setFillColor(red)
         c.setLineWidth(1)
 
-        rects = highlights_by_page.get(page_num_1_based, [])
-        
         # Group overlaps by position for labeling
         position_counts = {}
         if add_labels:
@@ -328,12 +596,18 @@ def annotate_pdf(input_pdf_path: str, highlights_by_page: Dict[int, List[Tuple[f
                 pos_label = get_position_label(x, y, page_width, page_height)
                 position_counts[pos_label] = position_counts.get(pos_label, 0) + 1
         
-        # Draw rectangles
-        for (x, y, w, h) in rects:
-            # PDFBox gives coordinates with bottom-left origin (y increases upward)
-            # Convert to top-left origin: y_top = page_height - y - h
-            y_topleft = page_height - y - h
-            c.rect(x, y_topleft, w, h, fill=1, stroke=1)
+        # Draw rectangles as pre-formatted "re B*" operators (the same ones c.rect emits),
+        # appended to the page in one call. Each rectangle is painted on its own, so
+        # overlapping regions show darker through the alpha.
+        rect_arr = np.asarray(rects, dtype=np.float64)
+        # PDFBox gives coordinates with bottom-left origin (y increases upward)
+        # Convert to top-left origin: y_top = page_height - y - h
+        y_topleft = page_height - rect_arr[:, 1] - rect_arr[:, 3]
+        c.addLiteral("\n".join(
+            f"n {fp_str(x, y, w, h)} re B*"
+            for x, y, w, h in zip(rect_arr[:, 0].tolist(), y_topleft.tolist(),
+                                  rect_arr[:, 2].tolist(), rect_arr[:, 3].tolist())
+        ))
         
         # Add position labels
         if add_labels and position_counts:
@@ -357,14 +631,19 @@ def annotate_pdf(input_pdf_path: str, highlights_by_page: Dict[int, List[Tuple[f
                     label_x, label_y = label_positions[pos_label]
                     c.drawString(label_x, label_y, f"{pos_label}: {count}")
 
+        c.showPage()
+
+    overlays = {}
+    if overlay_page_indices:
         c.save()
         buf.seek(0)
-        
-        # Merge overlay onto original page
-        overlay_reader = PdfReader(buf)
-        overlay_page = overlay_reader.pages[0]
-        
-        page.merge_page(overlay_page)
+        overlays = dict(zip(overlay_page_indices, PdfReader(buf).pages))
+
+    # Merge overlays onto their original pages; other pages are copied as-is
+    for page_idx, page in enumerate(reader.pages):
+        overlay_page = overlays.get(page_idx)
+        if overlay_page is not None:
+            page.merge_page(overlay_page)
         writer.add_page(page)
 
     # Write output PDF
@@ -375,13 +654,11 @@ def annotate_pdf(input_pdf_path: str, highlights_by_page: Dict[int, List[Tuple[f
 def calculate_character_statistics(overlaps: List[dict]) -> dict:
     """Calculate statistics about which characters overlap most frequently."""
     from collections import Counter
+    from itertools import chain
     
+    # Count each character's involvement in overlaps (Counter.update counts in C)
     char_counts = Counter()
-    
-    # Count each character's involvement in overlaps
-    for overlap in overlaps:
-        char_counts[overlap['char_a']] += 1
-        char_counts[overlap['char_b']] += 1
+    char_counts.update(chain.from_iterable((o['char_a'], o['char_b']) for o in overlaps))
     
     if not char_counts:
         return {"character_stats": [], "total_unique_chars": 0}
@@ -420,10 +697,10 @@ def export_overlaps_to_json(pdf_path: str, overlaps: List[dict], total_overlaps:
         if page not in data['overlaps_by_page']:
             data['overlaps_by_page'][page] = []
         
-        # Calculate actual overlap percentage between the two characters
+        # Overlap metrics were computed once during detection
         char_a = overlap['char_a']
         char_b = overlap['char_b']
-        overlap_metrics = calculate_overlap_percentage(overlap['a'], overlap['b'])
+        overlap_metrics = overlap['metrics']
         
         overlap_entry = {
             "char_a": char_a,
@@ -450,8 +727,14 @@ def export_overlaps_to_json(pdf_path: str, overlaps: List[dict], total_overlaps:
         
         data['overlaps_by_page'][page].append(overlap_entry)
     
-    with open(output_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    if orjson is not None:
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(
+                data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ))
+    else:
+        with open(output_path, 'w') as f:
+            json.dump(data, f, indent=2)
 
 
 def print_character_statistics(char_stats: dict, top_n: int = 10):
@@ -471,7 +754,7 @@ def print_character_statistics(char_stats: dict, top_n: int = 10):
         print(f"     {i:2d}. '{char_display}': {stat['overlap_count']:3d} ({stat['percentage']:5.2f}%) {bar}")
 
 
-def process_pdf(pdf_path: str, filter_watermarks=True, add_labels=True, overlap_threshold=0, export_json=False, show_stats=True, union_percentage_threshold: float = 0.0, enable_char_trim=False, trim_scale=1.0):
+def process_pdf(pdf_path: str, filter_watermarks=True, add_labels=True, overlap_threshold=0, export_json=False, show_stats=True, union_percentage_threshold: float = 0.0, enable_char_trim=False, trim_scale=1.0, page_workers=None):
     """Process a single PDF file for overlaps and create marked version if needed.
     
     Args:
@@ -482,19 +765,20 @@ def process_pdf(pdf_path: str, filter_watermarks=True, add_labels=True, overlap_
         export_json: Whether to export overlap data to JSON
         show_stats: Whether to print character statistics
         union_percentage_threshold: Per-overlap minimum percentage_of_union required to consider/mark (0-100)
+        page_workers: Threads used to scan pages (default: ThreadPoolExecutor's default; 1 = scan pages in the calling thread)
     
     Returns:
         tuple: (total_overlaps, marked_path, json_path, char_stats, filtered_count)
     """
     # Extract glyphs using PDFBox
-    glyphs_list = extract_glyph_bboxes(pdf_path)
+    glyphs = extract_glyph_bboxes(pdf_path)
     
     # Group by page (with optional watermark filtering and char trimming)
-    glyphs_by_page = group_glyphs_by_page(glyphs_list, filter_watermarks=filter_watermarks, enable_char_trim=enable_char_trim, trim_scale=trim_scale)
+    glyphs_by_page = group_glyphs_by_page(glyphs, filter_watermarks=filter_watermarks, enable_char_trim=enable_char_trim, trim_scale=trim_scale)
     
     # Find overlaps (filtered by percentage_of_union)
     overlaps, highlights_by_page, total_overlaps, filtered_count = find_overlaps_by_page(
-        glyphs_by_page, overlap_percentage_threshold=union_percentage_threshold
+        glyphs_by_page, overlap_percentage_threshold=union_percentage_threshold, max_workers=page_workers
     )
 
     # Create marked PDF if overlaps exceed threshold
@@ -518,6 +802,25 @@ def process_pdf(pdf_path: str, filter_watermarks=True, add_labels=True, overlap_
     return total_overlaps, marked_path
 
 
+def _process_one(job):
+    """
+    Worker entry point: run process_pdf for one (pdf_path, options) job.
+
+    Console output is captured so results from parallel workers can be printed in order.
+
+    Returns:
+        tuple: (captured_output, process_pdf result or None, error message or None)
+    """
+    pdf_path, options = job
+    buf = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buf):
+            result = process_pdf(pdf_path, **options)
+    except Exception as e:
+        return buf.getvalue(), None, str(e)
+    return buf.getvalue(), result, None
+
+
 def main():
     """Main entry point - process all PDFs in pdfs/ directory."""
     parser = argparse.ArgumentParser(
@@ -537,6 +840,7 @@ Examples:
   python run.py --union-threshold 20 --json  # Mark severe overlaps (>20% union) + export JSON
   python run.py --trim-whitespace --union-threshold 10  # Trimming + percentage filtering (recommended)
   python run.py --no-labels --json           # No position labels, with JSON export
+  python run.py --workers 4                  # Process up to 4 PDFs in parallel
         ''')
     
     parser.add_argument('--input', type=str, default=None, metavar='FILE_OR_PATTERN',
@@ -555,6 +859,8 @@ Examples:
                         help='Trim character-specific whitespace from glyph bounding boxes before overlap detection')
     parser.add_argument('--trim-scale', type=float, default=1.0, metavar='SCALE',
                         help='Scale factor for whitespace trimming (default: 1.0, use 0.5 for less trim, 2.0 for more)')
+    parser.add_argument('--workers', type=int, default=0, metavar='N',
+                        help='Number of PDFs to process in parallel (default: 0, one per CPU core; 1 = sequential)')
     
     args = parser.parse_args()
     filter_watermarks = not args.include_watermarks
@@ -598,24 +904,53 @@ Examples:
     
     total_marked = 0
     total_json = 0
-    
-    for pdf_path in pdf_paths:
-        pdf_name = os.path.basename(pdf_path)
-        print(f"Processing: {pdf_name}...", end=" ", flush=True)
-        
-        try:
-            overlaps_count, marked_path, json_path, char_stats, filtered_count = process_pdf(
-                pdf_path, 
-                filter_watermarks=filter_watermarks, 
-                add_labels=add_labels,
-                overlap_threshold=overlap_threshold,
-                export_json=export_json,
-                show_stats=True,
-                union_percentage_threshold=union_percentage_threshold,
-                enable_char_trim=enable_char_trim,
-                trim_scale=trim_scale
-            )
-            
+
+    # PDFs are independent; each worker process starts its own JVM on its first PDF.
+    # Page scan threads share the cores with the other workers instead of each taking all of them.
+    cpu_count = os.cpu_count() or 1
+    workers = min(args.workers or cpu_count, len(pdf_paths))
+    page_workers = max(1, cpu_count // workers)
+
+    options = dict(
+        filter_watermarks=filter_watermarks,
+        add_labels=add_labels,
+        overlap_threshold=overlap_threshold,
+        export_json=export_json,
+        show_stats=True,
+        union_percentage_threshold=union_percentage_threshold,
+        enable_char_trim=enable_char_trim,
+        trim_scale=trim_scale,
+        page_workers=page_workers
+    )
+    jobs = [(pdf_path, options) for pdf_path in pdf_paths]
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    results = executor.map(_process_one, jobs) if executor else map(_process_one, jobs)
+
+    # Set when a worker process dies (e.g. killed for running out of memory); the pool
+    # cannot run anything after that, so the remaining PDFs are reported as errors
+    pool_error = None
+
+    try:
+        for pdf_path in pdf_paths:
+            pdf_name = os.path.basename(pdf_path)
+            print(f"Processing: {pdf_name}...", end=" ", flush=True)
+
+            if pool_error is None:
+                try:
+                    log, result, error = next(results)
+                except BrokenProcessPool as e:
+                    pool_error = f"worker process pool failed: {e}"
+            if pool_error is not None:
+                log, result, error = "", None, pool_error
+
+            print(log, end="")
+            if error is not None:
+                print(f"✗ Error: {error}")
+                continue
+
+            overlaps_count, marked_path, json_path, char_stats, filtered_count = result
+
             outputs = []
             if overlaps_count == 0:
                 print(f"✓ No overlaps found")
@@ -625,27 +960,29 @@ Examples:
                     total_marked += 1
                 else:
                     outputs.append(f"not marked (threshold: {overlaps_count}<={overlap_threshold})")
-                
+
                 if json_path:
                     outputs.append(f"JSON: {os.path.basename(json_path)}")
                     total_json += 1
-                
+
                 if outputs:
                     print(f"✓ {overlaps_count} overlaps | {' | '.join(outputs)}")
                 else:
                     print(f"✓ {overlaps_count} overlaps")
-                
+
                 # Report filtered overlaps by union threshold
                 if union_percentage_threshold > 0 and filtered_count:
                     print(f"    (Filtered {filtered_count} overlaps below union threshold {union_percentage_threshold}%)")
-                
+
                 # Print character statistics
                 if char_stats:
                     print_character_statistics(char_stats, top_n=10)
-                
-        except Exception as e:
-            print(f"✗ Error: {e}")
-    
+    finally:
+        if executor:
+            # executor.map queued every PDF up front; drop the ones not yet started
+            # so Ctrl-C or an error in the report loop stops the batch promptly
+            executor.shutdown(cancel_futures=True)
+
     # Summary
     if len(pdf_paths) > 1:
         print(f"\n" + "="*70)
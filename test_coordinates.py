@@ -5,7 +5,7 @@ Creates a simple marked PDF with coordinate labels.
 """
 
 import io
-from PyPDF2 import PdfReader, PdfWriter
+from pypdf import PdfReader, PdfWriter
 from reportlab.pdfgen import canvas
 from reportlab.lib.colors import Color
 
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Regression check for the overlap detection in run.py.
+Compares find_overlaps_by_page against a brute-force pairwise reference on
+random pages, including huge and zero-size boxes and percentages sitting
+on the rounding boundary of the union threshold. Runs the numba kernel
+(when numba is installed) and the NumPy fallback.
+"""
+
+import random
+import sys
+
+import numpy as np
+
+import run
+
+
+def reference_overlaps(glyphs_by_page, overlap_percentage_threshold):
+    """Check every glyph pair on each page, the way the original pairwise loop did."""
+    overlaps = []
+    highlights_by_page = {}
+    filtered_count = 0
+    for page_num, (boxes, chars) in glyphs_by_page.items():
+        rects = set()
+        box_list = [tuple(b) for b in boxes.tolist()]
+        for i in range(len(box_list)):
+            ax, ay, aw, ah = box_list[i]
+            for j in range(i + 1, len(box_list)):
+                bx, by, bw, bh = box_list[j]
+                iw = min(ax + aw, bx + bw) - max(ax, bx)
+                ih = min(ay + ah, by + bh) - max(ay, by)
+                if iw <= 0 or ih <= 0:
+                    continue
+                overlap_area = iw * ih
+                union_area = aw * ah + bw * bh - overlap_area
+                pct = round(overlap_area / union_area * 100, 2)
+                if not pct > overlap_percentage_threshold:
+                    filtered_count += 1
+                    continue
+                overlaps.append((page_num, box_list[i], box_list[j], str(chars[i]), str(chars[j]), pct, {
+                    'overlap_area': round(overlap_area, 2),
+                    'percentage_of_a': round(overlap_area / (aw * ah) * 100, 2),
+                    'percentage_of_b': round(overlap_area / (bw * bh) * 100, 2),
+                    'percentage_of_total': pct
+                }))
+                rects.update((box_list[i], box_list[j]))
+        if rects:
+            highlights_by_page[page_num] = sorted(rects)
+    return overlaps, highlights_by_page, len(overlaps), filtered_count
+
+
+def random_page(rng):
+    """Text-like rows of glyphs plus a few zero-size, negative and huge boxes."""
+    boxes = []
+    x, y = 50.0, 700.0
+    for _ in range(rng.randint(0, 400)):
+        w = rng.uniform(2, 7)
+        h = rng.uniform(5, 10)
+        x += w * rng.uniform(0.6, 1.1)
+        if x > 550:
+            x = 50.0
+            y -= 11 + rng.uniform(-3, 0.5)
+        boxes.append((x, y, w, h))
+    for _ in range(rng.randint(0, 6)):
+        boxes.append(rng.choice([
+            (rng.uniform(50, 550), rng.uniform(0, 700), 0.0, rng.uniform(1, 10)),  # zero width
+            (rng.uniform(50, 550), rng.uniform(0, 700), rng.uniform(1, 10), 0.0),  # zero height
+            (rng.uniform(50, 550), rng.uniform(0, 700), -1.0, 5.0),  # negative width
+            (rng.uniform(0, 300), rng.uniform(0, 600), rng.uniform(100, 400), rng.uniform(50, 300)),  # frame
+            (-1e6, -1e6, 2e6, 2e6),  # covers the whole page
+            (0.0, rng.uniform(0, 700), 1e7, 2.0),  # very wide rule
+        ]))
+    rng.shuffle(boxes)
+    return boxes
+
+
+def _rounding_differs(value):
+    """True where np.round and Python's round() disagree at 2 decimals."""
+    return float(np.round(value, 2)) != round(value, 2)
+
+
+def boundary_page(rng):
+    """
+    Glyph pairs whose metrics sit on a .xx5 rounding boundary where np.round and
+    round() disagree. Returns the boxes and the raw union percentages of the
+    nested pairs, for use as thresholds.
+    """
+    boxes = []
+    union_pcts = []
+    while len(union_pcts) < 10:
+        # A 1x1 box inside a 1xH box overlaps 100/H percent of the union (and of the
+        # larger box); alternate which box comes first so both per-box metrics are hit
+        pct = 100 / (100 / (rng.randint(1, 9999) / 100 + 0.005))
+        if _rounding_differs(pct):
+            x = 20.0 * len(union_pcts)
+            pair = [(x, 10.0, 1.0, 1.0), (x, 10.0, 1.0, 100 / pct)]
+            boxes += pair if len(union_pcts) % 2 else pair[::-1]
+            union_pcts.append(pct)
+    count = 0
+    while count < 10:
+        # Stacked Wx1 and Wx2 boxes overlap by exactly W square points
+        width = rng.randint(1, 9999) / 100 + 0.005
+        if _rounding_differs(width):
+            x = 20.0 * count
+            boxes += [(x, 100.0, width, 1.0), (x, 100.0, width, 2.0)]
+            count += 1
+    return boxes, union_pcts
+
+
+def to_glyphs_by_page(pages):
+    glyphs_by_page = {}
+    for page_num, boxes in enumerate(pages, 1):
+        box_arr = np.array(boxes, dtype=np.float64).reshape(-1, 4)
+        chars = np.array([chr(ord('a') + k % 26) for k in range(len(boxes))], dtype=str)
+        glyphs_by_page[page_num] = (box_arr, chars)
+    return glyphs_by_page
+
+
+def normalize(result):
+    overlaps, highlights_by_page, total, filtered_count = result
+    rows = [
+        (o['page'], tuple(o['a']), tuple(o['b']), o['char_a'], o['char_b'], o['percentage_of_union'], o['metrics'])
+        for o in overlaps
+    ]
+    highlights = {page: sorted(rects) for page, rects in highlights_by_page.items()}
+    return rows, highlights, total, filtered_count
+
+
+def check(label, seed=0, rounds=25):
+    rng = random.Random(seed)
+    failures = 0
+    for n in range(rounds):
+        boundary_boxes, union_pcts = boundary_page(rng)
+        pages = [random_page(rng) for _ in range(rng.randint(1, 3))] + [boundary_boxes]
+        glyphs_by_page = to_glyphs_by_page(pages)
+
+        # Thresholds on both sides of a rounding boundary, plus ones hit by random pairs
+        expected = reference_overlaps(glyphs_by_page, 0.0)
+        pcts = [row[5] for row in expected[0]]
+        boundary = rng.choice(union_pcts)
+        thresholds = [0.0, 10.0, round(boundary, 2), float(np.round(boundary, 2)), rng.choice(pcts)]
+
+        for threshold in thresholds:
+            ref = reference_overlaps(glyphs_by_page, threshold)
+            got = normalize(run.find_overlaps_by_page(glyphs_by_page, overlap_percentage_threshold=threshold))
+            if got != ref:
+                failures += 1
+                print(f"  ✗ {label}: round {n}, threshold {threshold}: "
+                      f"{got[2]} overlaps / {got[3]} filtered, expected {ref[2]} / {ref[3]}")
+    print(f"{label}: {'OK' if failures == 0 else f'{failures} mismatches'}")
+    return failures
+
+
+if __name__ == "__main__":
+    failures = 0
+    if run._overlaps_numba is not None:
+        failures += check("numba kernel")
+    run._overlaps_numba = None
+    failures += check("NumPy kernel")
+    sys.exit(1 if failures else 0)